@@ -1,7 +1,9 @@
 import boto3
 import os
 import json
+import re
 import uuid
+import hashlib
 
 s3 = boto3.client("s3")
 
@@ -12,6 +14,11 @@ CORS_HEADERS = {
     "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
 }
 
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# Prefix in CONVERSIONS_BUCKET for the index of reusable conversions
+DEDUP_PREFIX = "dedup/"
+
 def handler(event, context):
     print(f"Event: {json.dumps(event)}")
     path = event.get("path", "")
@@ -38,14 +45,65 @@ def handler(event, context):
         traceback.print_exc()
         return {"statusCode": 500, "headers": CORS_HEADERS, "body": json.dumps({"message": str(e)})}
 
+def get_dedup_key(content_hash, target_format, params):
+    """Returns the key identifying a conversion of the given content with the given parameters."""
+    identity = json.dumps({"contentHash": content_hash, "targetFormat": target_format, "params": params}, sort_keys=True)
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+def find_existing_conversion(dedup_key):
+    """Returns the job id and output key of a completed conversion for dedup_key, if one exists."""
+    try:
+        meta = s3.head_object(Bucket=os.environ["CONVERSIONS_BUCKET"], Key=f"{DEDUP_PREFIX}{dedup_key}")
+        job_id = meta["Metadata"]["jobid"]
+        output_key = meta["Metadata"]["outputkey"]
+        # The index may outlive the output it points to
+        s3.head_object(Bucket=os.environ["CONVERSIONS_BUCKET"], Key=output_key)
+        return job_id, output_key
+    except Exception:
+        return None
+
 def get_upload_url(event):
     body = json.loads(event["body"])
     file_name = body.get("fileName")
     target_format = body.get("targetFormat", "stl")
+    content_hash = body.get("contentHash")
     
     if not file_name:
         return {"statusCode": 400, "headers": CORS_HEADERS, "body": json.dumps({"message": "fileName required"})}
     
+    metadata = {"targetformat": target_format}
+    params = {}
+    try:
+        if body.get("linearDeflection") is not None:
+            params["linearDeflection"] = float(body["linearDeflection"])
+            metadata["lindeflection"] = repr(params["linearDeflection"])
+        if body.get("angularDeflection") is not None:
+            params["angularDeflection"] = float(body["angularDeflection"])
+            metadata["angdeflection"] = repr(params["angularDeflection"])
+    except (TypeError, ValueError):
+        return {"statusCode": 400, "headers": CORS_HEADERS, "body": json.dumps({"message": "Invalid conversion parameters"})}
+    
+    if content_hash is not None:
+        content_hash = str(content_hash).lower()
+        if not SHA256_PATTERN.match(content_hash):
+            return {"statusCode": 400, "headers": CORS_HEADERS, "body": json.dumps({"message": "contentHash must be a SHA-256 hex digest"})}
+        
+        dedup_key = get_dedup_key(content_hash, target_format, params)
+        existing = find_existing_conversion(dedup_key)
+        if existing:
+            job_id, output_key = existing
+            print(f"Reusing conversion {output_key} for content hash {content_hash}")
+            download_url = s3.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": os.environ["CONVERSIONS_BUCKET"], "Key": output_key},
+                ExpiresIn=3600
+            )
+            return {"statusCode": 200, "headers": CORS_HEADERS, "body": json.dumps({"jobId": job_id, "status": "completed", "downloadUrl": download_url, "deduplicated": True})}
+        
+        # The converter verifies the uploaded content against the hash before recording the result
+        metadata["contenthash"] = content_hash
+        metadata["dedupkey"] = dedup_key
+    
     job_id = str(uuid.uuid4())
     key = f"{job_id}/{file_name}"
     
@@ -54,7 +112,7 @@ def get_upload_url(event):
         Params={
             "Bucket": os.environ["UPLOADS_BUCKET"],
             "Key": key,
-            "Metadata": {"targetformat": target_format}
+            "Metadata": metadata
         },
         ExpiresIn=3600
     )
@@ -74,7 +132,11 @@ def get_status(event):
             meta = s3.head_object(Bucket=os.environ["UPLOADS_BUCKET"], Key=uploads_key)
             status = meta.get("Metadata", {}).get("status", "processing")
             error = meta.get("Metadata", {}).get("error")
-            return {"statusCode": 200, "headers": CORS_HEADERS, "body": json.dumps({"jobId": job_id, "status": status, "error": error})}
+            result = {"jobId": job_id, "status": status, "error": error}
+            estimated_seconds = meta.get("Metadata", {}).get("estimatedseconds")
+            if estimated_seconds is not None:
+                result["estimatedSeconds"] = int(estimated_seconds)
+            return {"statusCode": 200, "headers": CORS_HEADERS, "body": json.dumps(result)}
         
         conversions_key = f"{job_id}.stl"
         try:
@@ -1,9 +1,33 @@
 import boto3
+import hashlib
 import os
-from main import convert
+from main import convert, warmup
+from preflight import scan_step
 
 s3 = boto3.client("s3")
 
+# Import the conversion backends during the Lambda init phase, which runs with
+# a full CPU allocation, instead of in the first invocation. CadQuery/OCC is
+# only imported by functions that set C3D_WARMUP_CADQUERY=1, i.e. those that
+# the dispatcher sends CAD jobs to.
+if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") and os.environ.get("C3D_WARMUP", "1") == "1":
+    warmup(cadquery=os.environ.get("C3D_WARMUP_CADQUERY") == "1")
+
+# Prefix in CONVERSIONS_BUCKET for the index of reusable conversions
+DEDUP_PREFIX = "dedup/"
+
+# STEP files estimated to take longer than this are rejected before OCC parses
+# them, leaving headroom under the 900 s function timeout for the transfers.
+# The estimate is for the 1024 MB function; faster tiers raise the limit.
+MAX_ESTIMATED_SECONDS = float(os.environ.get("MAX_ESTIMATED_SECONDS", 780))
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
 def handler(event, context):
     for record in event["Records"]:
         bucket = record["s3"]["bucket"]["name"]
@@ -12,30 +36,59 @@ def handler(event, context):
         
         try:
             meta = s3.head_object(Bucket=bucket, Key=key)
-            target_format = meta.get("Metadata", {}).get("targetformat", "stl")
+            metadata = meta.get("Metadata", {})
+            target_format = metadata.get("targetformat", "stl")
             file_name = key.split("/")[-1]
             source_format = file_name.split(".")[-1].lower()
+            conversion_params = {}
+            if "lindeflection" in metadata:
+                conversion_params["linear_deflection"] = float(metadata["lindeflection"])
+            if "angdeflection" in metadata:
+                conversion_params["angular_deflection"] = float(metadata["angdeflection"])
+            
+            input_file = f"/tmp/{file_name}"
+            output_file = f"/tmp/{job_id}.{target_format}"
+            
+            s3.download_file(bucket, key, input_file)
+            
+            if source_format in ("step", "stp"):
+                # The dispatcher scans files up to SCAN_MAX_BYTES and passes the report on
+                report = record.get("preflight") or scan_step(input_file)
+                print(f"Preflight: {report['entities']} entities, {report['faces']} faces, {report['nurbs_surfaces']} NURBS surfaces, {report['assembly_instances']} instances, ~{report['estimated_seconds']:.0f}s")
+                if not report["valid"]:
+                    raise ValueError(f"Malformed STEP file: {report['error']}")
+                if report["estimated_seconds"] > MAX_ESTIMATED_SECONDS:
+                    raise ValueError(f"STEP file too complex: estimated {report['estimated_seconds']:.0f}s exceeds the {MAX_ESTIMATED_SECONDS:.0f}s limit")
+                metadata["estimatedseconds"] = f"{report['estimated_seconds']:.0f}"
             
             s3.copy_object(
                 Bucket=bucket, Key=key,
                 CopySource={"Bucket": bucket, "Key": key},
-                Metadata={"status": "processing", "targetformat": target_format},
+                Metadata={**metadata, "status": "processing", "targetformat": target_format},
                 MetadataDirective="REPLACE"
             )
             
-            input_file = f"/tmp/{file_name}"
-            output_file = f"/tmp/{job_id}.{target_format}"
-            
-            s3.download_file(bucket, key, input_file)
-            convert(input_file, output_file, input_format=source_format, output_format=target_format)
+            convert(input_file, output_file, input_format=source_format, output_format=target_format, **conversion_params)
             
             output_key = f"{job_id}.{target_format}"
             s3.upload_file(output_file, os.environ["CONVERSIONS_BUCKET"], output_key)
             
+            # Record the result for reuse only if the upload matches the hash the client claimed
+            if "dedupkey" in metadata:
+                if file_sha256(input_file) == metadata.get("contenthash"):
+                    s3.put_object(
+                        Bucket=os.environ["CONVERSIONS_BUCKET"],
+                        Key=f"{DEDUP_PREFIX}{metadata['dedupkey']}",
+                        Body=b"",
+                        Metadata={"jobid": job_id, "outputkey": output_key}
+                    )
+                else:
+                    print(f"Content hash mismatch for {key}, not recording conversion for reuse")
+            
             s3.copy_object(
                 Bucket=bucket, Key=key,
                 CopySource={"Bucket": bucket, "Key": key},
-                Metadata={"status": "completed", "targetformat": target_format},
+                Metadata={**metadata, "status": "completed", "targetformat": target_format},
                 MetadataDirective="REPLACE"
             )
             
@@ -0,0 +1,118 @@
+import boto3
+import json
+import os
+from preflight import scan_step
+
+s3 = boto3.client("s3")
+lambda_client = boto3.client("lambda")
+
+MESH_FORMATS = ["obj", "stl", "3mf"]
+CAD_FORMATS = ["step", "stp"]
+
+# Mesh to mesh jobs up to this size run on the trimesh-only worker
+MESH_TIER_MAX_BYTES = 256 * 1024 * 1024
+
+# Conversions that main.convert streams in constant memory, so they run on the
+# mesh worker at any size. OBJ to STL is streamed too, but keeps every vertex
+# in memory, so it is bounded by MESH_TIER_MAX_BYTES like other mesh jobs.
+STREAMING_ROUTES = [("obj", "3mf")]
+
+# CAD jobs within both limits run on the standard worker, the rest on the
+# large-memory worker. The estimate comes from the STEP preflight scan.
+STANDARD_TIER_MAX_BYTES = 50 * 1024 * 1024
+STANDARD_TIER_MAX_SECONDS = 120
+
+# STEP files estimated to take longer than this are rejected rather than
+# dispatched. Like MAX_ESTIMATED_SECONDS on the 1024 MB worker it keeps 120 s of
+# the 900 s timeout for transfers, and the 10240 MB worker converts at most
+# about 1.7x faster (OCC meshing is mostly single-threaded): (900 - 120) * 1.7.
+LARGE_TIER_MAX_SECONDS = float(os.environ.get("LARGE_TIER_MAX_SECONDS", 1326))
+
+# STEP files larger than this are sent to the large worker without scanning
+SCAN_MAX_BYTES = 256 * 1024 * 1024
+
+# Environment variables holding the function name of each tier
+TIER_FUNCTIONS = {
+    "mesh": "MESH_FUNCTION",
+    "standard": "STANDARD_FUNCTION",
+    "large": "LARGE_FUNCTION",
+}
+
+def classify(source_format, target_format, size, report=None):
+    """Returns the (tier, reason) for a job; report is the STEP preflight scan, if any."""
+    if (source_format, target_format) in STREAMING_ROUTES:
+        return "mesh", "streamed mesh to mesh"
+    if source_format in MESH_FORMATS and target_format in MESH_FORMATS:
+        if size <= MESH_TIER_MAX_BYTES:
+            return "mesh", "mesh to mesh"
+        return "large", f"mesh larger than {MESH_TIER_MAX_BYTES} bytes"
+    if source_format in CAD_FORMATS:
+        if report is None:
+            return "large", f"STEP larger than {SCAN_MAX_BYTES} bytes"
+        if size > STANDARD_TIER_MAX_BYTES:
+            return "large", f"STEP larger than {STANDARD_TIER_MAX_BYTES} bytes"
+        if report["estimated_seconds"] > STANDARD_TIER_MAX_SECONDS:
+            return "large", f"estimated {report['estimated_seconds']:.0f}s exceeds {STANDARD_TIER_MAX_SECONDS}s"
+        return "standard", "small CAD job"
+    return "standard", "default"
+
+def handler(event, context):
+    for record in event["Records"]:
+        bucket = record["s3"]["bucket"]["name"]
+        key = record["s3"]["object"]["key"]
+        job_id = key.split("/")[0]
+
+        try:
+            meta = s3.head_object(Bucket=bucket, Key=key)
+            target_format = meta.get("Metadata", {}).get("targetformat", "stl")
+            source_format = key.split("/")[-1].split(".")[-1].lower()
+            size = meta["ContentLength"]
+
+            report = None
+            if source_format in CAD_FORMATS and size <= SCAN_MAX_BYTES:
+                report = scan_step(s3.get_object(Bucket=bucket, Key=key)["Body"])
+                if not report["valid"]:
+                    raise ValueError(f"Malformed STEP file: {report['error']}")
+                if report["estimated_seconds"] > LARGE_TIER_MAX_SECONDS:
+                    raise ValueError(f"STEP file too complex: estimated {report['estimated_seconds']:.0f}s exceeds the {LARGE_TIER_MAX_SECONDS:.0f}s limit")
+
+            tier, reason = classify(source_format, target_format, size, report)
+            function_name = os.environ.get(TIER_FUNCTIONS[tier]) or os.environ["STANDARD_FUNCTION"]
+
+            # One JSON line per decision, so thresholds can be tuned with CloudWatch Logs Insights
+            print(json.dumps({
+                "event": "dispatch",
+                "jobId": job_id,
+                "sourceFormat": source_format,
+                "targetFormat": target_format,
+                "size": size,
+                "tier": tier,
+                "reason": reason,
+                "function": function_name,
+                "faces": report and report["faces"],
+                "nurbsSurfaces": report and report["nurbs_surfaces"],
+                "assemblyInstances": report and report["assembly_instances"],
+                "estimatedSeconds": report and round(report["estimated_seconds"], 1),
+            }))
+
+            # Pass the scan on so the worker does not read the file twice
+            if report is not None:
+                record = {**record, "preflight": {k: v for k, v in report.items() if k != "counts"}}
+            lambda_client.invoke(
+                FunctionName=function_name,
+                InvocationType="Event",
+                Payload=json.dumps({"Records": [record]})
+            )
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            try:
+                s3.copy_object(
+                    Bucket=bucket, Key=key,
+                    CopySource={"Bucket": bucket, "Key": key},
+                    Metadata={"status": "failed", "error": str(e)[:256]},
+                    MetadataDirective="REPLACE"
+                )
+            except:
+                pass
+
+    return {"statusCode": 200}
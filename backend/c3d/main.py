@@ -1,14 +1,99 @@
 import argparse
+import http.client
+import importlib
+import io
+import ipaddress
+import itertools
+import json
+import multiprocessing
 import os
 import glob
-from typing import Callable
-import cadquery as cq
+import queue
+import shutil
+import struct
+import tempfile
+import threading
+import zipfile
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import BinaryIO, Callable, Iterator, Union
+import numpy as np
 import trimesh
 
+
+def import_cadquery():
+    """
+    Imports CadQuery on first use.
+
+    Importing OCC takes several seconds, so it is deferred until a conversion
+    actually needs it.
+    """
+    import cadquery
+
+    return cadquery
+
+
+def import_step(input_file: str):
+    """Imports a STEP file with CadQuery."""
+    return import_cadquery().importers.importStep(input_file)
+
+
+def import_step_stream(source: BinaryIO, unit: str = "MM"):
+    """
+    Imports a STEP file from a binary stream into a CadQuery Workplane, like
+    ``cadquery.importers.importStep`` does for a path.
+    """
+    cq = import_cadquery()
+    from OCP.IFSelect import IFSelect_RetDone
+    from OCP.Interface import Interface_Static
+    from OCP.STEPControl import STEPControl_Reader
+
+    Interface_Static.SetCVal_s("xstep.cascade.unit", unit.upper())
+    reader = STEPControl_Reader()
+    if reader.ReadStream("input.step", source) != IFSelect_RetDone:
+        raise ValueError("STEP data could not be loaded")
+    for i in range(reader.NbRootsForTransfer()):
+        reader.TransferRoot(i + 1)
+    solids = [cq.Shape.cast(reader.Shape(i + 1)) for i in range(reader.NbShapes())]
+    return cq.Workplane("XY").newObject(solids)
+
+
+def warmup(cadquery: bool = True):
+    """
+    Imports the conversion backends ahead of the first conversion, e.g. during
+    a Lambda init phase.
+
+    CadQuery is skipped if it is not installed, as in the mesh-only image.
+    """
+    # trimesh imports the dependencies of some loaders and exporters on first use
+    for module in ("networkx", "lxml.etree"):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    mesh = trimesh.load(
+        io.BytesIO(b"v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\n"), file_type="obj"
+    )
+    mesh.export(file_type="stl")
+    if cadquery:
+        try:
+            import_cadquery()
+        except ImportError:
+            pass
+
+
 # A dictionary mapping file extensions to their importer functions
 CADQUERY_IMPORTERS: dict[str, Callable] = {
-    ".step": cq.importers.importStep,
-    ".stp": cq.importers.importStep,
+    ".step": import_step,
+    ".stp": import_step,
+}
+
+# A dictionary mapping file extensions to importer functions reading a binary stream
+CADQUERY_STREAM_IMPORTERS: dict[str, Callable] = {
+    ".step": import_step_stream,
+    ".stp": import_step_stream,
 }
 
 # A dictionary mapping file extensions to their exporter functions
@@ -22,6 +107,13 @@ CADQUERY_EXPORTERS: dict[str, str] = {
 
 MESH_FORMATS = [".obj", ".stl", ".3mf"]
 
+# OBJ inputs at or above this size are converted by the streaming pipeline
+# instead of being loaded into memory by trimesh
+STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+# Approximate number of bytes of OBJ text parsed per chunk by the streaming pipeline
+STREAMING_CHUNK_BYTES = 4 * 1024 * 1024
+
 
 def get_file_extension(filename: str) -> str:
     """Returns the file extension in lowercase."""
@@ -58,7 +150,7 @@ def convert_with_cadquery(
     print(f"Exporting to {output_file} as {export_format}...")
     
     try:
-        cq.exporters.export(
+        import_cadquery().exporters.export(
             shape,
             output_file,
             exportType=export_format,
@@ -77,6 +169,150 @@ def convert_with_trimesh(input_file: str, output_file: str):
     mesh.export(output_file)
 
 
+def iter_obj_chunks(
+    input_file: str, chunk_bytes: int = STREAMING_CHUNK_BYTES
+) -> Iterator[tuple[array, array]]:
+    """
+    Parses an OBJ file in chunks of roughly ``chunk_bytes`` bytes.
+
+    Yields ``(vertices, triangles)`` pairs, where ``vertices`` is a flat array
+    of x, y, z coordinates and ``triangles`` a flat array of zero-based vertex
+    indices. Polygons are fan-triangulated and relative (negative) indices are
+    resolved against the vertices read so far.
+    """
+    vertex_count = 0
+    with open(input_file, "rb") as f:
+        while True:
+            lines = f.readlines(chunk_bytes)
+            if not lines:
+                break
+            vertices = array("d")
+            triangles = array("q")
+            for line in lines:
+                tokens = line.split()
+                if not tokens:
+                    continue
+                if tokens[0] == b"v":
+                    if len(tokens) < 4:
+                        raise ValueError(
+                            f"Vertex with fewer than 3 coordinates in {input_file}: {line.strip()!r}"
+                        )
+                    vertices.extend(
+                        (float(tokens[1]), float(tokens[2]), float(tokens[3]))
+                    )
+                    vertex_count += 1
+                elif tokens[0] == b"f":
+                    indices = []
+                    for token in tokens[1:]:
+                        index = int(token.split(b"/", 1)[0])
+                        indices.append(index - 1 if index > 0 else vertex_count + index)
+                    for i in range(1, len(indices) - 1):
+                        triangles.extend((indices[0], indices[i], indices[i + 1]))
+            yield vertices, triangles
+
+
+STL_TRIANGLE_DTYPE = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attributes", "<u2")]
+)
+
+
+def stream_obj_to_stl(input_file: str, output_file: str):
+    """Converts an OBJ file to binary STL without loading the whole mesh."""
+    vertex_table = array("d")
+    triangle_count = 0
+    with open(output_file, "wb") as out:
+        out.write(b"\0" * 80)
+        out.write(struct.pack("<I", 0))
+        for vertices, triangles in iter_obj_chunks(input_file):
+            vertex_table.extend(vertices)
+            if not triangles:
+                continue
+            indices = np.frombuffer(triangles, dtype=np.int64)
+            if indices.min() < 0 or indices.max() >= len(vertex_table) // 3:
+                raise ValueError(f"Face references an undefined vertex in {input_file}")
+            points = np.frombuffer(vertex_table, dtype=np.float64).reshape(-1, 3)
+            corners = points[indices].reshape(-1, 3, 3)
+            del points
+            normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+            lengths = np.linalg.norm(normals, axis=1)
+            lengths[lengths == 0] = 1.0
+            records = np.zeros(len(corners), dtype=STL_TRIANGLE_DTYPE)
+            records["normal"] = normals / lengths[:, None]
+            records["vertices"] = corners
+            out.write(records.tobytes())
+            triangle_count += len(records)
+        if triangle_count > 0xFFFFFFFF:
+            raise ValueError(f"Too many triangles for binary STL: {triangle_count}")
+        out.seek(80)
+        out.write(struct.pack("<I", triangle_count))
+
+
+THREEMF_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    "</Types>"
+)
+
+THREEMF_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel" '
+    'Target="/3D/3dmodel.model" Id="rel0"/>'
+    "</Relationships>"
+)
+
+
+def stream_obj_to_3mf(input_file: str, output_file: str):
+    """
+    Converts an OBJ file to 3MF without loading the whole mesh.
+
+    3MF lists every vertex before any triangle, so the input is read twice:
+    once to write the vertices and once to write the triangles.
+    """
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", THREEMF_CONTENT_TYPES)
+        zf.writestr("_rels/.rels", THREEMF_RELS)
+        with zf.open("3D/3dmodel.model", "w", force_zip64=True) as model:
+            model.write(
+                b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                b'<model unit="millimeter" '
+                b'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">'
+                b'<resources><object id="1" type="model"><mesh><vertices>'
+            )
+            vertex_count = 0
+            for vertices, _ in iter_obj_chunks(input_file):
+                model.write(
+                    "".join(
+                        f'<vertex x="{x!r}" y="{y!r}" z="{z!r}"/>'
+                        for x, y, z in zip(vertices[0::3], vertices[1::3], vertices[2::3])
+                    ).encode()
+                )
+                vertex_count += len(vertices) // 3
+            model.write(b"</vertices><triangles>")
+            for _, triangles in iter_obj_chunks(input_file):
+                if triangles and (min(triangles) < 0 or max(triangles) >= vertex_count):
+                    raise ValueError(f"Face references an undefined vertex in {input_file}")
+                model.write(
+                    "".join(
+                        f'<triangle v1="{a}" v2="{b}" v3="{c}"/>'
+                        for a, b, c in zip(triangles[0::3], triangles[1::3], triangles[2::3])
+                    ).encode()
+                )
+            model.write(
+                b"</triangles></mesh></object></resources>"
+                b'<build><item objectid="1"/></build></model>'
+            )
+
+
+# A dictionary mapping output extensions to their streaming OBJ converters
+STREAMING_OBJ_EXPORTERS: dict[str, Callable] = {
+    ".stl": stream_obj_to_stl,
+    ".3mf": stream_obj_to_3mf,
+}
+
+
 def convert(
     input_file: str,
     output_file: str,
@@ -96,7 +332,14 @@ def convert(
         f".{output_format}" if output_format else get_file_extension(output_file)
     )
 
-    if input_ext in MESH_FORMATS and output_ext in MESH_FORMATS:
+    if (
+        input_ext == ".obj"
+        and output_ext in STREAMING_OBJ_EXPORTERS
+        and os.path.getsize(input_file) >= STREAMING_THRESHOLD_BYTES
+    ):
+        print("Converting with streaming OBJ pipeline...")
+        STREAMING_OBJ_EXPORTERS[output_ext](input_file, output_file)
+    elif input_ext in MESH_FORMATS and output_ext in MESH_FORMATS:
         print("Converting with trimesh...")
         convert_with_trimesh(input_file, output_file)
     elif input_ext in CADQUERY_IMPORTERS and output_ext in CADQUERY_EXPORTERS:
@@ -120,10 +363,8 @@ def convert(
                 raise ValueError(f"No shape found in {input_file}")
 
             # Using an intermediate STL file for conversion
-            import tempfile
-
             with tempfile.NamedTemporaryFile(suffix=".stl", delete=False) as tmp:
-                cq.exporters.export(
+                import_cadquery().exporters.export(
                     shape,
                     tmp.name,
                     exportType="STL",
@@ -142,13 +383,312 @@ def convert(
     print(f"Successfully converted {input_file} to {output_file}")
 
 
+BufferSource = Union[bytes, bytearray, memoryview, BinaryIO]
+
+
+def convert_stream(
+    source: BufferSource,
+    output_stream: BinaryIO,
+    input_format: str,
+    output_format: str,
+    linear_deflection: float = 0.001,
+    angular_deflection: float = 0.1,
+):
+    """
+    Converts a 3D model read from a buffer or binary stream and writes the
+    result to ``output_stream``.
+
+    Mesh to mesh conversions are done entirely in memory. CAD inputs are read
+    from memory too; only the CadQuery exporters that take a path (STEP and
+    STL) write through a temporary file.
+    """
+    input_ext = f".{input_format.lower().lstrip('.')}"
+    output_ext = f".{output_format.lower().lstrip('.')}"
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    elif not source.seekable():
+        # Some loaders, e.g. 3MF (a zip archive), need to seek
+        source = io.BytesIO(source.read())
+
+    if input_ext in MESH_FORMATS and output_ext in MESH_FORMATS:
+        mesh = trimesh.load(file_obj=source, file_type=input_ext[1:])
+        data = mesh.export(file_type=output_ext[1:])
+        output_stream.write(data.encode() if isinstance(data, str) else data)
+    elif input_ext in CADQUERY_IMPORTERS and (
+        output_ext in CADQUERY_EXPORTERS or output_ext in MESH_FORMATS
+    ):
+        workplane = CADQUERY_STREAM_IMPORTERS[input_ext](source)
+        export_shape_stream(
+            workplane.val(), output_stream, output_ext, linear_deflection, angular_deflection
+        )
+    else:
+        raise ValueError(f"Unsupported conversion from {input_ext} to {output_ext}")
+
+
+def export_shape_stream(
+    shape,
+    output_stream: BinaryIO,
+    output_ext: str,
+    linear_deflection: float,
+    angular_deflection: float,
+):
+    """
+    Exports a CadQuery shape to ``output_stream``.
+
+    3MF and mesh formats are written in memory. CadQuery's STEP and STL
+    exporters only take a path, so those go through a temporary file.
+    """
+    if output_ext == ".3mf":
+        from cadquery.occ_impl.exporters.threemf import ThreeMFWriter
+
+        ThreeMFWriter(shape, linear_deflection, angular_deflection).write3mf(output_stream)
+    elif output_ext in CADQUERY_EXPORTERS:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_file = os.path.join(tmpdir, f"output{output_ext}")
+            import_cadquery().exporters.export(
+                shape,
+                output_file,
+                exportType=cast(ExportType, CADQUERY_EXPORTERS[output_ext]),
+                tolerance=linear_deflection,
+                angularTolerance=angular_deflection,
+            )
+            with open(output_file, "rb") as f:
+                shutil.copyfileobj(f, output_stream)
+    else:
+        vertices, triangles = shape.tessellate(linear_deflection, angular_deflection)
+        mesh = trimesh.Trimesh(
+            vertices=[v.toTuple() for v in vertices], faces=triangles
+        )
+        data = mesh.export(file_type=output_ext[1:])
+        output_stream.write(data.encode() if isinstance(data, str) else data)
+
+
+def convert_bytes(
+    data: BufferSource,
+    input_format: str,
+    output_format: str,
+    linear_deflection: float = 0.001,
+    angular_deflection: float = 0.1,
+) -> bytes:
+    """Converts a 3D model held in memory and returns the result as bytes."""
+    output = io.BytesIO()
+    convert_stream(
+        data, output, input_format, output_format, linear_deflection, angular_deflection
+    )
+    return output.getvalue()
+
+
 __version__ = "0.1.0"
 
 
+DEFAULT_SERVER_ADDRESS = "127.0.0.1:8765"
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    """Splits a ``host:port`` address."""
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def is_loopback(host: str) -> bool:
+    """Returns whether ``host`` is a loopback address."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+
+class ConversionServer(ThreadingHTTPServer):
+    """
+    A long-lived local conversion server.
+
+    Jobs are accepted over HTTP into a bounded priority queue (lower priority
+    values run first) and executed by worker processes forked from a
+    forkserver that has CadQuery/OCC and trimesh imported, so every worker
+    starts warm. Each worker has its own single-process pool, so a worker that
+    crashes only fails its own job and is replaced by a fresh fork. Workers
+    are never forked from this process itself, which runs the HTTP threads.
+
+    The server has no authentication and reads and writes the paths it is
+    sent, so it only listens on loopback addresses.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], workers: int = 2, queue_size: int = 64):
+        if not is_loopback(address[0]):
+            raise ValueError(f"Refusing to listen on non-loopback address {address[0]}")
+        super().__init__(address, ConversionRequestHandler)
+        self.jobs: queue.PriorityQueue = queue.PriorityQueue(maxsize=queue_size)
+        self._sequence = itertools.count()
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            self._context = multiprocessing.get_context("forkserver")
+            # Modules that fail to import, e.g. cadquery in the mesh-only image, are skipped
+            self._context.set_forkserver_preload(["trimesh", "cadquery", __name__])
+        else:
+            self._context = multiprocessing.get_context("spawn")
+        self.pools = [self._new_pool() for _ in range(workers)]
+        for index in range(workers):
+            threading.Thread(target=self._dispatch, args=(index,), daemon=True).start()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        """Starts a warm single-process worker pool."""
+        pool = ProcessPoolExecutor(max_workers=1, mp_context=self._context, initializer=warmup)
+        # Start the worker process up front so its first job is warm too
+        pool.submit(os.getpid).result()
+        return pool
+
+    def submit(self, job: dict, priority: int = 0) -> Future:
+        """Queues a conversion job. Raises ``queue.Full`` if the queue is full."""
+        future: Future = Future()
+        self.jobs.put_nowait((priority, next(self._sequence), job, future))
+        return future
+
+    def _dispatch(self, index: int):
+        while True:
+            _, _, job, future = self.jobs.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self.pools[index].submit(convert, **job).result())
+                except BrokenProcessPool:
+                    # The worker died, e.g. OCC crashed on a bad file
+                    self.pools[index].shutdown(wait=False)
+                    self.pools[index] = self._new_pool()
+                    future.set_exception(
+                        RuntimeError(f"Worker crashed while converting {job['input_file']}")
+                    )
+                except Exception as e:
+                    future.set_exception(e)
+            self.jobs.task_done()
+
+    def server_close(self):
+        super().server_close()
+        for pool in self.pools:
+            pool.shutdown(cancel_futures=True)
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """Serves ``POST /jobs`` and ``GET /health`` for a ConversionServer."""
+
+    server: ConversionServer
+
+    def _reply(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._reply(404, {"message": "Not Found"})
+        self._reply(200, {"status": "ok", "queued": self.server.jobs.qsize()})
+
+    def do_POST(self):
+        if self.path != "/jobs":
+            return self._reply(404, {"message": "Not Found"})
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            job = {
+                "input_file": body["input_file"],
+                "output_file": body["output_file"],
+                "linear_deflection": float(body.get("linear_deflection", 0.001)),
+                "angular_deflection": float(body.get("angular_deflection", 0.1)),
+                "input_format": body.get("input_format"),
+                "output_format": body.get("output_format"),
+            }
+            priority = int(body.get("priority", 0))
+        except (KeyError, TypeError, ValueError) as e:
+            return self._reply(400, {"message": f"Invalid job: {e}"})
+
+        try:
+            future = self.server.submit(job, priority)
+        except queue.Full:
+            return self._reply(503, {"message": "Job queue is full"})
+
+        try:
+            future.result()
+        except (FileNotFoundError, ValueError) as e:
+            return self._reply(422, {"message": str(e)})
+        except Exception as e:
+            return self._reply(500, {"message": str(e)})
+        self._reply(200, {"status": "completed", "output_file": job["output_file"]})
+
+
+def submit_remote(address: str, job: dict) -> dict:
+    """
+    Submits a conversion job to a ``c3d serve`` server and waits for it.
+
+    Errors the server reports for the job itself are raised as ValueError.
+    """
+    host, port = parse_address(address)
+    connection = http.client.HTTPConnection(host, port)
+    try:
+        connection.request(
+            "POST", "/jobs", json.dumps(job), {"Content-Type": "application/json"}
+        )
+        response = connection.getresponse()
+        body = json.loads(response.read())
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise ValueError(body.get("message", f"Server error {response.status}"))
+    return body
+
+
+def serve(argv: Optional[list[str]] = None):
+    """
+    The entry point for ``c3d serve``.
+    """
+    parser = argparse.ArgumentParser(
+        prog="c3d serve", description="Run a warm local c3d conversion server."
+    )
+    parser.add_argument(
+        "--address",
+        default=DEFAULT_SERVER_ADDRESS,
+        help="host:port to listen on. Only loopback hosts are allowed.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help="Number of worker processes.",
+    )
+    parser.add_argument(
+        "--queue_size",
+        type=int,
+        default=64,
+        help="Maximum number of queued jobs.",
+    )
+    args = parser.parse_args(argv)
+    if not is_loopback(parse_address(args.address)[0]):
+        parser.error(
+            "--address must be a loopback address; the server reads and writes "
+            "any path it is sent and has no authentication"
+        )
+
+    server = ConversionServer(parse_address(args.address), args.workers, args.queue_size)
+    print(f"c3d server listening on {args.address} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 def main():
     """
     The main entry point for the CLI.
     """
+    import sys
+
+    if sys.argv[1:2] == ["serve"]:
+        return serve(sys.argv[2:])
+
     parser = argparse.ArgumentParser(description="c3d: A 3D file conversion tool.")
     parser.add_argument(
         "input",
@@ -174,6 +714,22 @@ def main():
         default=0.1,
         help="Angular deflection for meshing.",
     )
+    parser.add_argument(
+        "--remote",
+        action="store_true",
+        help="Submit jobs to a running 'c3d serve' server instead of converting locally.",
+    )
+    parser.add_argument(
+        "--server",
+        default=DEFAULT_SERVER_ADDRESS,
+        help="host:port of the server used with --remote.",
+    )
+    parser.add_argument(
+        "--priority",
+        type=int,
+        default=0,
+        help="Job priority used with --remote; lower values run first.",
+    )
     parser.add_argument(
         "--version", action="version", version=f"%(prog)s {__version__}"
     )
@@ -187,8 +743,6 @@ def main():
 
     if not input_files:
         print("Error: No input files found.")
-        import sys
-
         sys.exit(1)
 
     output_is_dir = os.path.isdir(args.output) or (
@@ -200,8 +754,6 @@ def main():
 
     if len(input_files) > 1 and not output_is_dir:
         print("Error: When converting multiple files, the output must be a directory.")
-        import sys
-
         sys.exit(1)
 
     for input_file in input_files:
@@ -213,14 +765,32 @@ def main():
             output_file = args.output
 
         try:
-            convert(
-                input_file,
-                output_file,
-                args.lin_deflection,
-                args.ang_deflection,
-                args.input_format,
-                args.output_format,
-            )
+            if args.remote:
+                submit_remote(
+                    args.server,
+                    {
+                        "input_file": os.path.abspath(input_file),
+                        "output_file": os.path.abspath(output_file),
+                        "linear_deflection": args.lin_deflection,
+                        "angular_deflection": args.ang_deflection,
+                        "input_format": args.input_format,
+                        "output_format": args.output_format,
+                        "priority": args.priority,
+                    },
+                )
+                print(f"Successfully converted {input_file} to {output_file}")
+            else:
+                convert(
+                    input_file,
+                    output_file,
+                    args.lin_deflection,
+                    args.ang_deflection,
+                    args.input_format,
+                    args.output_format,
+                )
+        except ConnectionError:
+            print(f"Error: No c3d server at {args.server}. Start one with 'c3d serve'.")
+            sys.exit(1)
         except (FileNotFoundError, ValueError) as e:
             print(f"Error converting {input_file}: {e}")
 
@@ -0,0 +1,125 @@
+"""
+Reproducible cold-start measurement for the conversion container images.
+
+Builds an image, then starts it repeatedly in fresh containers with the Lambda
+Runtime Interface Emulator that ships in the AWS base images, and times the
+first invocation of each container. The event has no records, so the handler
+does no conversion work and the timing is the cold start itself: container
+start, imports, module initialisation and the init-phase warmup.
+
+Reports the wall-clock time to the first response and the ``Init Duration``
+from the emulator's REPORT line.
+
+Usage:
+    python backend/tests/cold_start.py --runs 5
+    python backend/tests/cold_start.py --dockerfile Dockerfile.mesh --handler converter.handler
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import time
+import urllib.error
+import urllib.request
+
+C3D_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "c3d")
+
+INVOKE_PATH = "/2015-03-31/functions/function/invocations"
+INIT_DURATION_RE = re.compile(r"Init Duration: ([\d.]+) ms")
+
+# Environment passed to the container so the handler behaves as in Lambda
+LAMBDA_ENV = {
+    "AWS_LAMBDA_FUNCTION_NAME": "c3d-cold-start",
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "cold-start",
+    "AWS_SECRET_ACCESS_KEY": "cold-start",
+    "UPLOADS_BUCKET": "c3d-cold-start-uploads",
+    "CONVERSIONS_BUCKET": "c3d-cold-start-conversions",
+    "STANDARD_FUNCTION": "c3d-cold-start",
+    # As on the CAD tiers; the mesh image has no CadQuery and skips it
+    "C3D_WARMUP_CADQUERY": "1",
+}
+
+
+def build_image(dockerfile: str, tag: str):
+    """Builds the image from backend/c3d."""
+    subprocess.run(
+        ["docker", "build", "--platform", "linux/amd64", "-f", os.path.join(C3D_DIR, dockerfile), "-t", tag, C3D_DIR],
+        check=True,
+    )
+
+
+def measure_cold_start(tag: str, handler: str, env: dict, timeout: float = 120) -> dict:
+    """Starts a fresh container, invokes it once and returns the timings."""
+    command = ["docker", "run", "-d", "--rm", "--platform", "linux/amd64", "-p", "127.0.0.1::8080"]
+    for name, value in env.items():
+        command += ["-e", f"{name}={value}"]
+    start = time.perf_counter()
+    container = subprocess.run(command + [tag, handler], check=True, capture_output=True, text=True).stdout.strip()
+    try:
+        port = subprocess.run(
+            ["docker", "port", container, "8080/tcp"], check=True, capture_output=True, text=True
+        ).stdout.split(":")[-1].strip()
+        url = f"http://127.0.0.1:{port}{INVOKE_PATH}"
+
+        # The emulator accepts connections as soon as the container is up, so
+        # retry until it answers and time the whole wait
+        while True:
+            try:
+                request = urllib.request.Request(url, data=json.dumps({"Records": []}).encode(), method="POST")
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+                break
+            except (urllib.error.URLError, ConnectionError):
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError(f"Container {container} did not respond within {timeout}s")
+                time.sleep(0.05)
+        first_response = time.perf_counter() - start
+
+        logs = subprocess.run(["docker", "logs", container], capture_output=True, text=True)
+        match = INIT_DURATION_RE.search(logs.stdout + logs.stderr)
+        return {
+            "firstResponse": first_response,
+            "initDuration": float(match.group(1)) / 1000 if match else None,
+        }
+    finally:
+        subprocess.run(["docker", "stop", container], capture_output=True)
+
+
+def summarize(values: list[float]) -> str:
+    return f"min {min(values):.2f} s, median {statistics.median(values):.2f} s, max {max(values):.2f} s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold starts of the c3d conversion image.")
+    parser.add_argument("--dockerfile", default="Dockerfile", help="Dockerfile in backend/c3d to build.")
+    parser.add_argument("--tag", default="c3d-cold-start", help="Image tag to build and run.")
+    parser.add_argument("--handler", default="converter.handler", help="Handler to start.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts to measure.")
+    parser.add_argument("--no_build", action="store_true", help="Use an existing image.")
+    parser.add_argument("--no_warmup", action="store_true", help="Disable the init-phase warmup (C3D_WARMUP=0).")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    if not args.no_build:
+        build_image(args.dockerfile, args.tag)
+
+    env = dict(LAMBDA_ENV, C3D_WARMUP="0" if args.no_warmup else "1")
+    results = [measure_cold_start(args.tag, args.handler, env) for _ in range(args.runs)]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"Image:          {args.tag} ({args.dockerfile}, {args.handler})")
+    print(f"Runs:           {args.runs}")
+    print(f"First response: {summarize([r['firstResponse'] for r in results])}")
+    init_durations = [r["initDuration"] for r in results if r["initDuration"] is not None]
+    if init_durations:
+        print(f"Init duration:  {summarize(init_durations)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+Local load-test harness for the upload -> convert -> download pipeline.
+
+Runs the API handler (``backend/api/app.py``), the dispatcher
+(``backend/c3d/dispatcher.py``) and the conversion handler
+(``backend/c3d/converter.py``) in-process against an S3 stand-in provided by
+moto, driving each job through the same steps as the deployed pipeline:
+
+1. ``POST /upload-url`` to get a presigned upload URL
+2. upload the file to the uploads bucket
+3. deliver a synthetic S3 ``ObjectCreated`` event to the dispatcher, which
+   invokes the conversion handler for the chosen tier
+4. ``GET /status/{job_id}`` and ``GET /download-url/{job_id}``
+5. download the converted file
+
+Every tier runs the same in-process conversion handler, synchronously.
+
+Reports jobs/sec, end-to-end latency percentiles, S3 requests per job and the
+number of jobs per tier.
+
+Usage:
+    python backend/tests/loadtest.py --jobs 50 --concurrency 8
+"""
+
+import argparse
+import collections
+import importlib.util
+import io
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlparse
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+ASSETS_DIR = os.path.join(BACKEND_DIR, "tests", "test_assets")
+
+UPLOADS_BUCKET = "c3d-loadtest-uploads"
+CONVERSIONS_BUCKET = "c3d-loadtest-conversions"
+
+JOB_ID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+)
+
+# Icosphere subdivisions used for the synthetic mesh payloads
+MESH_SIZES = {"small": 1, "medium": 4, "large": 6}
+
+# Environment variables holding the function name of each tier, as in dispatcher.py
+TIER_FUNCTIONS = {
+    "mesh": "MESH_FUNCTION",
+    "standard": "STANDARD_FUNCTION",
+    "large": "LARGE_FUNCTION",
+}
+
+
+def load_module(name: str, path: str):
+    """Imports a handler module from a file path under a unique module name."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_payloads(include_cad: bool = True) -> list[tuple[str, bytes]]:
+    """Builds the mix of input files as ``(extension, contents)`` pairs."""
+    import trimesh
+
+    payloads = []
+    for subdivisions in MESH_SIZES.values():
+        mesh = trimesh.creation.icosphere(subdivisions=subdivisions)
+        for ext in ("obj", "stl", "3mf"):
+            payloads.append((ext, mesh.export(file_type=ext)))
+    if include_cad:
+        with open(os.path.join(ASSETS_DIR, "sample.step"), "rb") as f:
+            payloads.append(("step", f.read()))
+    return [
+        (ext, data.encode() if isinstance(data, str) else data)
+        for ext, data in payloads
+    ]
+
+
+class S3RequestCounter:
+    """
+    Counts S3 API calls per job by hooking into boto3 clients.
+
+    Calls are attributed to a job by the job id found in their ``Key`` or
+    ``Prefix``, which also covers calls made from s3transfer worker threads.
+    Presigned URL generation is not an S3 request and is ignored.
+    """
+
+    def __init__(self):
+        self.counts = collections.defaultdict(collections.Counter)
+        self._lock = threading.Lock()
+
+    def attach(self, client):
+        client.meta.events.register("before-parameter-build.s3", self._on_call)
+
+    def _on_call(self, params, context, event_name, **kwargs):
+        if context.get("is_presign_request"):
+            return
+        match = JOB_ID_PATTERN.search(
+            str(params.get("Key", "")) + str(params.get("Prefix", ""))
+        )
+        job_id = match.group(0) if match else "unattributed"
+        with self._lock:
+            self.counts[job_id][event_name.rsplit(".", 1)[-1]] += 1
+
+
+class LocalLambdaClient:
+    """
+    Stands in for the dispatcher's Lambda client, running the conversion
+    handler in-process for every tier and recording which function was invoked.
+    """
+
+    def __init__(self, converter):
+        self.converter = converter
+        self.invocations = collections.Counter()
+        self._lock = threading.Lock()
+
+    def invoke(self, FunctionName, InvocationType, Payload):
+        with self._lock:
+            self.invocations[FunctionName] += 1
+        self.converter.handler(json.loads(Payload), None)
+        return {"StatusCode": 202}
+
+
+def api_call(api, method: str, path: str, body: dict = None, job_id: str = None):
+    """Invokes the API handler with an API Gateway proxy event."""
+    event = {"httpMethod": method, "path": path}
+    if body is not None:
+        event["body"] = json.dumps(body)
+    if job_id is not None:
+        event["pathParameters"] = {"job_id": job_id}
+    response = api.handler(event, None)
+    return response["statusCode"], json.loads(response["body"] or "{}")
+
+
+def run_job(api, dispatcher, client, index: int, ext: str, data: bytes, target_format: str) -> dict:
+    """Runs one job end to end and returns its latency and outcome."""
+    start = time.perf_counter()
+    file_name = f"part-{index}.{ext}"
+
+    status_code, body = api_call(
+        api, "POST", "/upload-url", {"fileName": file_name, "targetFormat": target_format}
+    )
+    if status_code != 200:
+        raise RuntimeError(f"upload-url failed: {body}")
+    job_id = body["jobId"]
+
+    # Upload the way a browser would, using the metadata signed into the URL
+    upload_url = urlparse(body["uploadUrl"])
+    key = unquote(upload_url.path.lstrip("/"))
+    metadata = {
+        name[len("x-amz-meta-"):]: values[0]
+        for name, values in parse_qs(upload_url.query).items()
+        if name.startswith("x-amz-meta-")
+    }
+    client.put_object(Bucket=UPLOADS_BUCKET, Key=key, Body=data, Metadata=metadata)
+
+    dispatcher.handler(
+        {
+            "Records": [{
+                "eventSource": "aws:s3",
+                "eventName": "ObjectCreated:Put",
+                "s3": {
+                    "bucket": {"name": UPLOADS_BUCKET},
+                    "object": {"key": key, "size": len(data)},
+                },
+            }]
+        },
+        None,
+    )
+
+    _, body = api_call(api, "GET", f"/status/{job_id}", job_id=job_id)
+    status = body.get("status")
+    if status == "completed":
+        status_code, body = api_call(api, "GET", f"/download-url/{job_id}", job_id=job_id)
+        if status_code != 200:
+            status = "download-failed"
+        else:
+            download_key = unquote(urlparse(body["downloadUrl"]).path.lstrip("/"))
+            client.get_object(Bucket=CONVERSIONS_BUCKET, Key=download_key)["Body"].read()
+
+    return {
+        "jobId": job_id,
+        "format": ext,
+        "size": len(data),
+        "status": status,
+        "latency": time.perf_counter() - start,
+    }
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Returns the nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def run_load_test(
+    jobs: int = 20,
+    concurrency: int = 4,
+    target_format: str = "stl",
+    include_cad: bool = True,
+) -> dict:
+    """Runs ``jobs`` conversions with ``concurrency`` workers and returns a report."""
+    from moto import mock_aws
+
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "loadtest")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "loadtest")
+    os.environ["UPLOADS_BUCKET"] = UPLOADS_BUCKET
+    os.environ["CONVERSIONS_BUCKET"] = CONVERSIONS_BUCKET
+    for tier, variable in TIER_FUNCTIONS.items():
+        os.environ[variable] = f"c3d-loadtest-{tier}"
+
+    payloads = make_payloads(include_cad)
+
+    with mock_aws():
+        import boto3
+
+        # The handlers create their S3 clients at import time, so they must be
+        # imported once the mock is active
+        sys.path.insert(0, os.path.join(BACKEND_DIR, "c3d"))
+        api = load_module(f"loadtest_api_{uuid.uuid4().hex}", os.path.join(BACKEND_DIR, "api", "app.py"))
+        converter = load_module(f"loadtest_converter_{uuid.uuid4().hex}", os.path.join(BACKEND_DIR, "c3d", "converter.py"))
+        dispatcher = load_module(f"loadtest_dispatcher_{uuid.uuid4().hex}", os.path.join(BACKEND_DIR, "c3d", "dispatcher.py"))
+        lambda_client = LocalLambdaClient(converter)
+        dispatcher.lambda_client = lambda_client
+        client = boto3.client("s3")
+
+        counter = S3RequestCounter()
+        for c in (api.s3, dispatcher.s3, converter.s3, client):
+            counter.attach(c)
+
+        client.create_bucket(Bucket=UPLOADS_BUCKET)
+        client.create_bucket(Bucket=CONVERSIONS_BUCKET)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(run_job, api, dispatcher, client, i, *payloads[i % len(payloads)], target_format)
+                for i in range(jobs)
+            ]
+            results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+
+    latencies = [r["latency"] for r in results]
+    requests_per_job = [sum(counter.counts[r["jobId"]].values()) for r in results]
+    operations = collections.Counter()
+    for r in results:
+        operations.update(counter.counts[r["jobId"]])
+
+    return {
+        "jobs": jobs,
+        "concurrency": concurrency,
+        "completed": sum(r["status"] == "completed" for r in results),
+        "elapsed": elapsed,
+        "jobsPerSecond": jobs / elapsed,
+        "latency": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+        },
+        "s3RequestsPerJob": statistics.mean(requests_per_job),
+        "s3OperationsPerJob": {op: n / jobs for op, n in sorted(operations.items())},
+        "tiers": {
+            tier: lambda_client.invocations[f"c3d-loadtest-{tier}"] for tier in TIER_FUNCTIONS
+        },
+        "results": results,
+    }
+
+
+def print_report(report: dict):
+    """Prints a human-readable summary of a load-test report."""
+    print(f"Jobs:            {report['completed']}/{report['jobs']} completed")
+    print(f"Concurrency:     {report['concurrency']}")
+    print(f"Elapsed:         {report['elapsed']:.2f} s")
+    print(f"Throughput:      {report['jobsPerSecond']:.2f} jobs/s")
+    for name, value in report["latency"].items():
+        print(f"Latency {name}:     {value * 1000:.1f} ms")
+    print(f"S3 requests/job: {report['s3RequestsPerJob']:.1f}")
+    for op, n in report["s3OperationsPerJob"].items():
+        print(f"  {op}: {n:.1f}")
+    print("Jobs per tier:")
+    for tier, n in report["tiers"].items():
+        print(f"  {tier}: {n}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local load test for the c3d pipeline.")
+    parser.add_argument("--jobs", type=int, default=20, help="Number of jobs to run.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of concurrent jobs.")
+    parser.add_argument("--target_format", default="stl", help="Output format for every job.")
+    parser.add_argument("--no_cad", action="store_true", help="Skip STEP inputs (no CadQuery conversions).")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON.")
+    args = parser.parse_args()
+
+    # Keep the handlers' per-step logging out of the report
+    stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+        report = run_load_test(args.jobs, args.concurrency, args.target_format, not args.no_cad)
+    finally:
+        sys.stdout = stdout
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
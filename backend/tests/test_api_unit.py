@@ -0,0 +1,93 @@
+import json
+import pytest
+import importlib.util
+from unittest.mock import patch
+import sys
+import os
+
+# backend/api/app.py shares its module name with backend/c3d/app.py
+spec = importlib.util.spec_from_file_location("api_app", os.path.join(os.path.dirname(__file__), '../api/app.py'))
+api_app = importlib.util.module_from_spec(spec)
+sys.modules["api_app"] = api_app
+spec.loader.exec_module(api_app)
+
+CONTENT_HASH = "a" * 64
+
+
+@pytest.fixture
+def mock_env(monkeypatch):
+    monkeypatch.setenv("UPLOADS_BUCKET", "test-uploads")
+    monkeypatch.setenv("CONVERSIONS_BUCKET", "test-conversions")
+
+
+@patch('api_app.s3')
+def test_get_upload_url_without_hash(mock_s3, mock_env):
+    mock_s3.generate_presigned_url.return_value = "https://presigned-url"
+    
+    event = {"body": json.dumps({"fileName": "test.step", "targetFormat": "stl"})}
+    response = api_app.get_upload_url(event)
+    
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["uploadUrl"] == "https://presigned-url"
+    assert not mock_s3.head_object.called
+    metadata = mock_s3.generate_presigned_url.call_args.kwargs["Params"]["Metadata"]
+    assert metadata == {"targetformat": "stl"}
+
+
+@patch('api_app.s3')
+def test_get_upload_url_dedup_hit(mock_s3, mock_env):
+    mock_s3.head_object.return_value = {"Metadata": {"jobid": "job123", "outputkey": "job123.stl"}}
+    mock_s3.generate_presigned_url.return_value = "https://download-url"
+    
+    event = {"body": json.dumps({"fileName": "test.step", "targetFormat": "stl", "contentHash": CONTENT_HASH})}
+    response = api_app.get_upload_url(event)
+    
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body == {"jobId": "job123", "status": "completed", "downloadUrl": "https://download-url", "deduplicated": True}
+    assert mock_s3.generate_presigned_url.call_args.args[0] == "get_object"
+
+
+@patch('api_app.s3')
+def test_get_upload_url_dedup_miss(mock_s3, mock_env):
+    mock_s3.head_object.side_effect = Exception("Not found")
+    mock_s3.generate_presigned_url.return_value = "https://presigned-url"
+    
+    event = {"body": json.dumps({"fileName": "test.step", "targetFormat": "stl", "contentHash": CONTENT_HASH.upper(), "linearDeflection": 0.01})}
+    response = api_app.get_upload_url(event)
+    
+    assert response["statusCode"] == 200
+    assert "uploadUrl" in json.loads(response["body"])
+    metadata = mock_s3.generate_presigned_url.call_args.kwargs["Params"]["Metadata"]
+    assert metadata["contenthash"] == CONTENT_HASH
+    assert metadata["lindeflection"] == "0.01"
+    assert metadata["dedupkey"] == api_app.get_dedup_key(CONTENT_HASH, "stl", {"linearDeflection": 0.01})
+
+
+@patch('api_app.s3')
+def test_get_upload_url_invalid_hash(mock_s3, mock_env):
+    event = {"body": json.dumps({"fileName": "test.step", "contentHash": "not-a-hash"})}
+    response = api_app.get_upload_url(event)
+    
+    assert response["statusCode"] == 400
+    assert not mock_s3.generate_presigned_url.called
+
+
+def test_dedup_key_depends_on_target_and_params():
+    key = api_app.get_dedup_key(CONTENT_HASH, "stl", {})
+    assert key == api_app.get_dedup_key(CONTENT_HASH, "stl", {})
+    assert key != api_app.get_dedup_key(CONTENT_HASH, "obj", {})
+    assert key != api_app.get_dedup_key(CONTENT_HASH, "stl", {"linearDeflection": 0.01})
+
+
+@patch('api_app.s3')
+def test_get_status_includes_preflight_estimate(mock_s3, mock_env):
+    mock_s3.list_objects_v2.return_value = {"Contents": [{"Key": "job123/test.step"}]}
+    mock_s3.head_object.return_value = {"Metadata": {"status": "processing", "estimatedseconds": "42"}}
+    
+    event = {"pathParameters": {"job_id": "job123"}}
+    response = api_app.get_status(event)
+    
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["estimatedSeconds"] == 42
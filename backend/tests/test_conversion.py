@@ -1,3 +1,4 @@
+import io
 import os
 import pytest
 import tempfile
@@ -74,3 +75,297 @@ def test_conversion_with_glob(monkeypatch):
         # Check that the output files were created
         for i in range(3):
             assert os.path.exists(os.path.join(output_dir, f"test{i}.stl"))
+
+
+@pytest.mark.parametrize("output_ext", [".stl", ".3mf"])
+def test_streaming_obj_conversion(monkeypatch, output_ext):
+    """Test that large OBJ files are converted by the streaming pipeline."""
+    import trimesh
+    import backend.c3d.main as c3d_main
+
+    monkeypatch.setattr(c3d_main, "STREAMING_THRESHOLD_BYTES", 0)
+    monkeypatch.setattr(
+        c3d_main,
+        "convert_with_trimesh",
+        lambda *args: pytest.fail("trimesh route used for a large OBJ"),
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_file = os.path.join(tmpdir, f"output{output_ext}")
+        convert("backend/tests/test_assets/sample.obj", output_file)
+
+        expected = trimesh.load("backend/tests/test_assets/sample.obj")
+        result = trimesh.load(output_file, force="mesh")
+        assert len(result.faces) == len(expected.faces)
+        assert result.bounds.flatten().tolist() == pytest.approx(expected.bounds.flatten().tolist())
+
+
+def test_streaming_obj_triangulates_polygons():
+    """Test that polygons and relative indices are triangulated on the fly."""
+    from backend.c3d.main import iter_obj_chunks
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_file = os.path.join(tmpdir, "quad.obj")
+        with open(input_file, "w") as f:
+            f.write("v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\n")
+            f.write("vn 0 0 1\nf 1//1 2//1 3//1 4//1\nf -4 -3 -2\n")
+
+        chunks = list(iter_obj_chunks(input_file))
+        triangles = [index for _, chunk in chunks for index in chunk]
+        assert triangles == [0, 1, 2, 0, 2, 3, 0, 1, 2]
+
+
+def test_streaming_obj_whitespace():
+    """Test that indented and tab-separated OBJ lines are parsed."""
+    from backend.c3d.main import iter_obj_chunks
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_file = os.path.join(tmpdir, "tabs.obj")
+        with open(input_file, "w") as f:
+            f.write("v\t0 0 0\n  v 1\t0 0\n\tv 0 1 0\r\n\nf\t1 2 3\n  f 3 2 1\n")
+
+        chunks = list(iter_obj_chunks(input_file))
+        vertices = [x for chunk, _ in chunks for x in chunk]
+        triangles = [index for _, chunk in chunks for index in chunk]
+        assert vertices == [0, 0, 0, 1, 0, 0, 0, 1, 0]
+        assert triangles == [0, 1, 2, 2, 1, 0]
+
+
+def test_streaming_obj_short_vertex():
+    """Test that vertices with fewer than 3 coordinates are rejected."""
+    from backend.c3d.main import iter_obj_chunks
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_file = os.path.join(tmpdir, "short.obj")
+        with open(input_file, "w") as f:
+            f.write("v 0 0 0\nv 1 0\nf 1 2 1\n")
+
+        with pytest.raises(ValueError):
+            list(iter_obj_chunks(input_file))
+
+
+def test_streaming_obj_undefined_vertex():
+    """Test that faces referencing undefined vertices are rejected."""
+    from backend.c3d.main import stream_obj_to_stl
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_file = os.path.join(tmpdir, "bad.obj")
+        with open(input_file, "w") as f:
+            f.write("v 0 0 0\nv 1 0 0\nf 1 2 3\n")
+
+        with pytest.raises(ValueError):
+            stream_obj_to_stl(input_file, os.path.join(tmpdir, "bad.stl"))
+
+
+@pytest.mark.parametrize(
+    "input_file, input_format, output_format",
+    [
+        ("backend/tests/test_assets/sample.obj", "obj", "stl"),
+        ("backend/tests/test_assets/sample.obj", "obj", "3mf"),
+        ("backend/tests/test_assets/sample.3mf", "3mf", "obj"),
+        ("backend/tests/test_assets/sample.step", "step", "stl"),
+        ("backend/tests/test_assets/sample.step", "step", "step"),
+        ("backend/tests/test_assets/sample.step", "step", "3mf"),
+        ("backend/tests/test_assets/sample.step", "step", "obj"),
+    ],
+)
+def test_convert_bytes(input_file, input_format, output_format):
+    """Test in-memory conversion from bytes and memoryview inputs."""
+    import trimesh
+    from backend.c3d.main import convert_bytes
+
+    with open(input_file, "rb") as f:
+        data = f.read()
+
+    for source in (data, memoryview(data)):
+        result = convert_bytes(source, input_format, output_format)
+        assert len(result) > 0
+        if output_format != "step":
+            mesh = trimesh.load(io.BytesIO(result), file_type=output_format, force="mesh")
+            assert len(mesh.faces) > 0
+
+
+def test_convert_stream():
+    """Test conversion from a file-like object into an output stream."""
+    import trimesh
+    from backend.c3d.main import convert_stream
+
+    output = io.BytesIO()
+    with open("backend/tests/test_assets/sample.obj", "rb") as f:
+        convert_stream(f, output, ".OBJ", "stl")
+
+    mesh = trimesh.load(io.BytesIO(output.getvalue()), file_type="stl")
+    assert len(mesh.faces) == 12
+
+
+def test_convert_stream_step_in_memory(monkeypatch):
+    """Test that STEP to 3MF/OBJ conversions do not go through temporary files."""
+    import trimesh
+    from backend.c3d.main import convert_bytes
+
+    def no_temporary_files(*args, **kwargs):
+        raise AssertionError("temporary file used")
+
+    monkeypatch.setattr("tempfile.TemporaryDirectory", no_temporary_files)
+    monkeypatch.setattr("tempfile.NamedTemporaryFile", no_temporary_files)
+    with open("backend/tests/test_assets/sample.step", "rb") as f:
+        data = f.read()
+
+    for output_format in ("3mf", "obj"):
+        result = convert_bytes(data, "step", output_format)
+        mesh = trimesh.load(io.BytesIO(result), file_type=output_format, force="mesh")
+        assert len(mesh.faces) > 0
+
+
+def test_convert_bytes_malformed_step():
+    """Test in-memory conversion of data that is not a STEP file."""
+    from backend.c3d.main import convert_bytes
+
+    with pytest.raises(ValueError):
+        convert_bytes(b"solid test\nendsolid test\n", "step", "stl")
+
+
+def test_convert_bytes_unsupported_format():
+    """Test in-memory conversion with an unsupported format."""
+    from backend.c3d.main import convert_bytes
+
+    with pytest.raises(ValueError):
+        convert_bytes(b"dummy", "txt", "stl")
+
+
+def test_conversion_server():
+    """Test submitting jobs to a warm conversion server."""
+    import threading
+    from backend.c3d.main import ConversionServer, submit_remote
+
+    server = ConversionServer(("127.0.0.1", 0), workers=1, queue_size=4)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    address = f"127.0.0.1:{server.server_address[1]}"
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_file = os.path.join(tmpdir, "output.stl")
+            result = submit_remote(
+                address,
+                {
+                    "input_file": os.path.abspath("backend/tests/test_assets/sample.obj"),
+                    "output_file": output_file,
+                },
+            )
+            assert result["status"] == "completed"
+            assert os.path.getsize(output_file) > 0
+
+            with pytest.raises(ValueError):
+                submit_remote(
+                    address,
+                    {
+                        "input_file": os.path.join(tmpdir, "missing.step"),
+                        "output_file": output_file,
+                    },
+                )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _convert_or_crash(input_file, output_file, **kwargs):
+    """Converts like ``convert``, but kills the worker for the input "crash"."""
+    import signal
+
+    if input_file == "crash":
+        os.kill(os.getpid(), signal.SIGKILL)
+    return convert(input_file, output_file, **kwargs)
+
+
+def test_conversion_server_worker_crash(monkeypatch):
+    """Test that a crashed worker fails only its own job and is replaced."""
+    import threading
+    from backend.c3d.main import ConversionServer, submit_remote
+
+    monkeypatch.setattr("backend.c3d.main.convert", _convert_or_crash)
+    server = ConversionServer(("127.0.0.1", 0), workers=1, queue_size=4)
+    # Replacement workers must not be forked from the threaded server process
+    assert server._context.get_start_method() == "forkserver"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    address = f"127.0.0.1:{server.server_address[1]}"
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_file = os.path.join(tmpdir, "output.stl")
+            with pytest.raises(ValueError, match="crashed"):
+                submit_remote(address, {"input_file": "crash", "output_file": output_file})
+
+            result = submit_remote(
+                address,
+                {
+                    "input_file": os.path.abspath("backend/tests/test_assets/sample.obj"),
+                    "output_file": output_file,
+                },
+            )
+            assert result["status"] == "completed"
+            assert os.path.getsize(output_file) > 0
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_conversion_server_rejects_non_loopback_address():
+    """Test that the server refuses to listen on a non-loopback address."""
+    from backend.c3d.main import ConversionServer, serve
+
+    with pytest.raises(ValueError):
+        ConversionServer(("0.0.0.0", 0))
+    with pytest.raises(SystemExit):
+        serve(["--address", "0.0.0.0:8765"])
+
+
+def test_remote_without_server(monkeypatch, capsys):
+    """Test that --remote fails clearly when no server is running."""
+    import socket
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    monkeypatch.setattr(
+        "sys.argv",
+        ["c3d", "backend/tests/test_assets/sample.obj", "out.stl", "--remote", "--server", f"127.0.0.1:{port}"],
+    )
+    with pytest.raises(SystemExit):
+        main()
+    assert "No c3d server" in capsys.readouterr().out
+
+
+def test_warmup():
+    """Test that warmup imports CadQuery and the trimesh loader dependencies."""
+    import sys
+    from backend.c3d.main import warmup
+
+    warmup()
+
+    assert "cadquery" in sys.modules
+    assert "networkx" in sys.modules
+
+
+def test_convert_stream_non_seekable_source():
+    """Test conversion from a stream that cannot seek, e.g. a socket or pipe."""
+    import trimesh
+    from backend.c3d.main import convert_stream
+
+    class NonSeekable(io.RawIOBase):
+        def __init__(self, data):
+            self._data = io.BytesIO(data)
+
+        def readable(self):
+            return True
+
+        def readinto(self, buffer):
+            return self._data.readinto(buffer)
+
+    with open("backend/tests/test_assets/sample.3mf", "rb") as f:
+        source = io.BufferedReader(NonSeekable(f.read()))
+    assert not source.seekable()
+
+    output = io.BytesIO()
+    convert_stream(source, output, "3mf", "stl")
+
+    mesh = trimesh.load(io.BytesIO(output.getvalue()), file_type="stl")
+    assert len(mesh.faces) > 0
@@ -29,7 +29,12 @@ def s3_event():
 
 @patch('converter.s3')
 @patch('converter.convert')
-def test_handler_success(mock_convert, mock_s3, s3_event, mock_env):
+@patch('converter.scan_step')
+def test_handler_success(mock_scan_step, mock_convert, mock_s3, s3_event, mock_env):
+    mock_scan_step.return_value = {
+        "valid": True, "error": None, "entities": 1, "faces": 1,
+        "nurbs_surfaces": 0, "assembly_instances": 0, "estimated_seconds": 1.0
+    }
     mock_s3.head_object.return_value = {"Metadata": {"targetformat": "stl"}}
     mock_s3.download_file.return_value = None
     mock_s3.upload_file.return_value = None
@@ -46,6 +51,23 @@ def test_handler_success(mock_convert, mock_s3, s3_event, mock_env):
             assert mock_s3.upload_file.called
 
 
+@patch('converter.s3')
+@patch('converter.convert')
+@patch('converter.scan_step')
+def test_handler_uses_dispatcher_preflight(mock_scan_step, mock_convert, mock_s3, s3_event, mock_env):
+    s3_event["Records"][0]["preflight"] = {
+        "valid": True, "error": None, "entities": 1, "faces": 1,
+        "nurbs_surfaces": 0, "assembly_instances": 0, "estimated_seconds": 1.0
+    }
+    mock_s3.head_object.return_value = {"Metadata": {"targetformat": "stl"}}
+    
+    handler(s3_event, None)
+    
+    assert not mock_scan_step.called
+    assert mock_convert.called
+    assert mock_s3.copy_object.call_args_list[0].kwargs["Metadata"]["estimatedseconds"] == "1"
+
+
 @patch('converter.s3')
 @patch('converter.convert')
 def test_handler_conversion_failure(mock_convert, mock_s3, s3_event, mock_env):
@@ -67,3 +89,83 @@ def test_handler_missing_metadata(mock_s3, s3_event, mock_env):
     response = handler(s3_event, None)
     
     assert response["statusCode"] == 200
+
+
+@pytest.mark.parametrize("hash_matches", [True, False])
+def test_handler_records_dedup_index(hash_matches, s3_event, mock_env, monkeypatch):
+    import boto3
+    import hashlib
+    from moto import mock_aws
+    
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with open(os.path.join(os.path.dirname(__file__), "test_assets/sample.step"), "rb") as f:
+        content = f.read()
+    content_hash = hashlib.sha256(content if hash_matches else b"other").hexdigest()
+    
+    with mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket="test-uploads")
+        client.create_bucket(Bucket="test-conversions")
+        client.put_object(
+            Bucket="test-uploads", Key="job123/test.step", Body=content,
+            Metadata={"targetformat": "stl", "contenthash": content_hash, "dedupkey": "key123"}
+        )
+        monkeypatch.setattr("converter.s3", client)
+        monkeypatch.setattr("converter.convert", lambda input_file, output_file, **kwargs: open(output_file, "wb").close())
+        
+        handler(s3_event, None)
+        
+        status = client.head_object(Bucket="test-uploads", Key="job123/test.step")["Metadata"]
+        assert status["status"] == "completed"
+        index = client.list_objects_v2(Bucket="test-conversions", Prefix="dedup/").get("Contents", [])
+        if hash_matches:
+            meta = client.head_object(Bucket="test-conversions", Key="dedup/key123")["Metadata"]
+            assert meta == {"jobid": "job123", "outputkey": "job123.stl"}
+        else:
+            assert index == []
+
+
+@pytest.mark.parametrize("report, message", [
+    ({"valid": False, "error": "Missing DATA section", "estimated_seconds": 1.0}, "Malformed STEP file"),
+    ({"valid": True, "error": None, "estimated_seconds": 5000.0}, "too complex"),
+])
+@patch('converter.s3')
+@patch('converter.convert')
+@patch('converter.scan_step')
+def test_handler_preflight_rejects(mock_scan_step, mock_convert, mock_s3, report, message, s3_event, mock_env):
+    mock_scan_step.return_value = {"entities": 1, "faces": 1, "nurbs_surfaces": 0, "assembly_instances": 0, **report}
+    mock_s3.head_object.return_value = {"Metadata": {"targetformat": "stl"}}
+    
+    response = handler(s3_event, None)
+    
+    assert response["statusCode"] == 200
+    assert not mock_convert.called
+    metadata = mock_s3.copy_object.call_args.kwargs["Metadata"]
+    assert metadata["status"] == "failed"
+    assert message in metadata["error"]
+
+
+@pytest.mark.parametrize("env, calls", [
+    ({}, []),
+    ({"AWS_LAMBDA_FUNCTION_NAME": "c3d"}, [False]),
+    ({"AWS_LAMBDA_FUNCTION_NAME": "c3d", "C3D_WARMUP_CADQUERY": "1"}, [True]),
+    ({"AWS_LAMBDA_FUNCTION_NAME": "c3d", "C3D_WARMUP_CADQUERY": "1", "C3D_WARMUP": "0"}, []),
+])
+def test_init_warmup(monkeypatch, env, calls):
+    import importlib.util
+    import main
+    
+    for name in ("AWS_LAMBDA_FUNCTION_NAME", "C3D_WARMUP", "C3D_WARMUP_CADQUERY"):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    warmup = Mock()
+    monkeypatch.setattr(main, "warmup", warmup)
+    
+    # Run the module initialisation again, as a Lambda init phase would
+    spec = importlib.util.spec_from_file_location("converter_init", os.path.join(os.path.dirname(__file__), "../c3d/converter.py"))
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
+    
+    assert [c.kwargs["cadquery"] for c in warmup.call_args_list] == calls
@@ -0,0 +1,107 @@
+import json
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../c3d'))
+# The Lambda client needs a region at import time; the Lambda runtime sets one
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from dispatcher import handler, classify, STANDARD_TIER_MAX_SECONDS, LARGE_TIER_MAX_SECONDS
+
+
+@pytest.fixture
+def mock_env(monkeypatch):
+    monkeypatch.setenv("MESH_FUNCTION", "mesh-fn")
+    monkeypatch.setenv("STANDARD_FUNCTION", "standard-fn")
+    monkeypatch.setenv("LARGE_FUNCTION", "large-fn")
+
+
+def s3_event(key):
+    return {"Records": [{"s3": {"bucket": {"name": "test-uploads"}, "object": {"key": key}}}]}
+
+
+def step_report(estimated_seconds=10.0, valid=True):
+    return {
+        "valid": valid, "error": None if valid else "Missing DATA section",
+        "faces": 100, "nurbs_surfaces": 0, "assembly_instances": 0,
+        "estimated_seconds": estimated_seconds,
+    }
+
+
+@pytest.mark.parametrize("source_format, target_format, size, report, tier", [
+    ("obj", "stl", 1024, None, "mesh"),
+    ("obj", "3mf", 10 * 1024 ** 3, None, "mesh"),
+    ("obj", "stl", 10 * 1024 ** 3, None, "large"),
+    ("stl", "3mf", 10 * 1024 ** 3, None, "large"),
+    ("step", "stl", 1024, step_report(), "standard"),
+    ("step", "stl", 1024, step_report(STANDARD_TIER_MAX_SECONDS + 1), "large"),
+    ("step", "stl", 1024 ** 3, step_report(), "large"),
+    ("step", "stl", 1024 ** 3, None, "large"),
+])
+def test_classify(source_format, target_format, size, report, tier):
+    assert classify(source_format, target_format, size, report)[0] == tier
+
+
+@patch('dispatcher.lambda_client')
+@patch('dispatcher.s3')
+def test_handler_routes_mesh_job(mock_s3, mock_lambda, mock_env, capsys):
+    mock_s3.head_object.return_value = {"Metadata": {"targetformat": "stl"}, "ContentLength": 1024}
+    event = s3_event("job123/part.obj")
+    
+    response = handler(event, None)
+    
+    assert response["statusCode"] == 200
+    assert not mock_s3.get_object.called
+    kwargs = mock_lambda.invoke.call_args.kwargs
+    assert kwargs["FunctionName"] == "mesh-fn"
+    assert kwargs["InvocationType"] == "Event"
+    assert json.loads(kwargs["Payload"]) == event
+    decision = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert decision["event"] == "dispatch"
+    assert decision["tier"] == "mesh"
+
+
+@patch('dispatcher.lambda_client')
+@patch('dispatcher.s3')
+@patch('dispatcher.scan_step')
+def test_handler_routes_step_job(mock_scan_step, mock_s3, mock_lambda, mock_env):
+    mock_scan_step.return_value = step_report()
+    mock_s3.head_object.return_value = {"Metadata": {"targetformat": "stl"}, "ContentLength": 1024}
+    
+    handler(s3_event("job123/part.step"), None)
+    
+    assert mock_scan_step.called
+    kwargs = mock_lambda.invoke.call_args.kwargs
+    assert kwargs["FunctionName"] == "standard-fn"
+    assert json.loads(kwargs["Payload"])["Records"][0]["preflight"]["estimated_seconds"] == 10.0
+
+
+@patch('dispatcher.lambda_client')
+@patch('dispatcher.s3')
+@patch('dispatcher.scan_step')
+def test_handler_rejects_malformed_step(mock_scan_step, mock_s3, mock_lambda, mock_env):
+    mock_scan_step.return_value = step_report(valid=False)
+    mock_s3.head_object.return_value = {"Metadata": {"targetformat": "stl"}, "ContentLength": 1024}
+    
+    response = handler(s3_event("job123/part.step"), None)
+    
+    assert response["statusCode"] == 200
+    assert not mock_lambda.invoke.called
+    assert mock_s3.copy_object.call_args.kwargs["Metadata"]["status"] == "failed"
+
+
+@patch('dispatcher.lambda_client')
+@patch('dispatcher.s3')
+@patch('dispatcher.scan_step')
+def test_handler_rejects_too_complex_step(mock_scan_step, mock_s3, mock_lambda, mock_env):
+    mock_scan_step.return_value = step_report(LARGE_TIER_MAX_SECONDS + 1)
+    mock_s3.head_object.return_value = {"Metadata": {"targetformat": "stl"}, "ContentLength": 1024}
+    
+    handler(s3_event("job123/part.step"), None)
+    
+    assert not mock_lambda.invoke.called
+    metadata = mock_s3.copy_object.call_args.kwargs["Metadata"]
+    assert metadata["status"] == "failed"
+    assert "too complex" in metadata["error"]
@@ -0,0 +1,28 @@
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from loadtest import run_load_test, percentile
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 99) == 3.0
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+def test_load_test_completes_all_jobs():
+    report = run_load_test(jobs=6, concurrency=3, include_cad=False)
+
+    assert report["completed"] == 6
+    assert report["jobsPerSecond"] > 0
+    assert report["latency"]["p50"] <= report["latency"]["p95"] <= report["latency"]["p99"]
+    assert report["s3RequestsPerJob"] > 0
+    assert "PutObject" in report["s3OperationsPerJob"]
+    assert sum(report["tiers"].values()) == 6
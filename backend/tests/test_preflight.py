@@ -0,0 +1,90 @@
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../c3d'))
+
+from preflight import scan_step, estimate_cost
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), "test_assets")
+
+
+def write_step(tmp_path, data):
+    path = tmp_path / "part.step"
+    path.write_text(
+        "ISO-10303-21;\nHEADER;\nFILE_DESCRIPTION(('test'),'2;1');\n"
+        "FILE_NAME('part','2024-01-01T00:00:00',(''),(''),'','','');\n"
+        "FILE_SCHEMA(('AP203'));\nENDSEC;\nDATA;\n" + data + "ENDSEC;\nEND-ISO-10303-21;\n"
+    )
+    return str(path)
+
+
+def test_scan_sample_step():
+    report = scan_step(os.path.join(ASSETS_DIR, "sample.step"))
+    
+    assert report["valid"]
+    assert report["schema"].startswith("AUTOMOTIVE_DESIGN")
+    assert report["faces"] == 6
+    assert report["shells"] == 1
+    assert report["solids"] == 1
+    assert report["counts"]["ADVANCED_FACE"] == 6
+    assert report["estimated_seconds"] == pytest.approx(estimate_cost(report))
+
+
+def test_scan_counts_are_independent_of_chunk_size():
+    path = os.path.join(ASSETS_DIR, "example.step")
+    
+    assert scan_step(path, chunk_bytes=1000)["counts"] == scan_step(path)["counts"]
+
+
+def test_scan_small_chunks():
+    report = scan_step(os.path.join(ASSETS_DIR, "sample.step"), chunk_bytes=256)
+    
+    assert report["valid"]
+    assert report["faces"] == 6
+
+
+@pytest.mark.parametrize("padding", ["\n" * 100, "\n/* exported by test; end of file */\n", " \r\n" * 1000])
+def test_scan_trailing_padding(tmp_path, padding):
+    with open(os.path.join(ASSETS_DIR, "sample.step"), "rb") as f:
+        data = f.read()
+    path = tmp_path / "padded.step"
+    path.write_bytes(data + padding.encode())
+    
+    report = scan_step(str(path), chunk_bytes=1024)
+    
+    assert report["valid"]
+    assert report["faces"] == 6
+
+
+def test_scan_complex_entities(tmp_path):
+    path = write_step(tmp_path, (
+        "#1 = ( BOUNDED_SURFACE() B_SPLINE_SURFACE(1,1,((#2,#3),(#4,#5)),.UNSPECIFIED.,.F.,.F.,.F.)\n"
+        "  B_SPLINE_SURFACE_WITH_KNOTS((2),(2),(0.,1.),(0.,1.),.UNSPECIFIED.)\n"
+        "  GEOMETRIC_REPRESENTATION_ITEM() RATIONAL_B_SPLINE_SURFACE(((1.,1.),(1.,1.)))\n"
+        "  REPRESENTATION_ITEM('') SURFACE() );\n"
+        "#6 = NEXT_ASSEMBLY_USAGE_OCCURRENCE('1','a;b','',#7,#8,$);\n"
+    ))
+    report = scan_step(path)
+    
+    assert report["valid"]
+    assert report["entities"] == 2
+    assert report["nurbs_surfaces"] == 1
+    assert report["assembly_instances"] == 1
+    assert report["counts"]["RATIONAL_B_SPLINE_SURFACE"] == 1
+
+
+@pytest.mark.parametrize("content, error", [
+    ("solid test\nendsolid test\n", "signature"),
+    ("ISO-10303-21;\nHEADER;\nENDSEC;\n", "DATA"),
+    ("ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\n#1 = CARTESIAN_POINT('',(0.,0.,0.));\n", "truncated"),
+    ("ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\n#1 = CARTESIAN_POINT('',(0.,0.,0.));\nENDSEC;\nEND-ISO-10303-21;\n#2 = CARTESIAN_POINT('',(0.,0.,0.));\n", "truncated"),
+])
+def test_scan_malformed(tmp_path, content, error):
+    path = tmp_path / "bad.step"
+    path.write_text(content)
+    
+    report = scan_step(str(path))
+    
+    assert not report["valid"]
+    assert error in report["error"]
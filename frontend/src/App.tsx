@@ -18,6 +18,27 @@ import { useDarkMode } from './useDarkMode';
 
 axios.defaults.baseURL = import.meta.env.VITE_API_ENDPOINT || '';
 
+// Web Crypto can only hash a whole buffer, so larger files are not hashed
+const MAX_HASH_BYTES = 256 * 1024 * 1024;
+
+// SHA-256 of the file contents, used by the API to reuse earlier conversions.
+// Best effort: returns undefined if the file is too large or hashing fails,
+// and the file is then uploaded and converted as usual.
+const sha256Hex = async (file: File): Promise<string | undefined> => {
+  if (file.size > MAX_HASH_BYTES || !crypto?.subtle) {
+    return undefined;
+  }
+  try {
+    const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+    return Array.from(new Uint8Array(digest))
+      .map((byte) => byte.toString(16).padStart(2, '0'))
+      .join('');
+  } catch (error) {
+    console.warn('Could not hash file, skipping deduplication:', file.name, error);
+    return undefined;
+  }
+};
+
 type ChipTone = 'primary' | 'success' | 'danger' | 'warning' | 'muted';
 
 const formatOptions = ['stl', 'step', 'stp', 'obj', '3mf'];
@@ -115,8 +136,19 @@ const App = () => {
         const uploadUrlResponse = await axios.post('/upload-url', {
           fileName: file.name,
           targetFormat,
+          contentHash: await sha256Hex(file),
         });
-        const { uploadUrl, jobId } = uploadUrlResponse.data;
+        const { uploadUrl, jobId, downloadUrl } = uploadUrlResponse.data;
+
+        if (uploadUrlResponse.data.status === 'completed') {
+          setProgress((prev) => ({ ...prev, [file.name]: 100 }));
+          setDownloadUrls((prev) => ({ ...prev, [file.name]: downloadUrl }));
+          setConversionStatus((prev) => ({
+            ...prev,
+            [file.name]: 'Completed',
+          }));
+          return;
+        }
 
         setConversionStatus((prev) => ({
           ...prev,